@@ -1,10 +1,27 @@
-import pandas as pd
+import argparse
+import csv
+
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src import MetroParser
 
-parser = MetroParser()
+arg_parser = argparse.ArgumentParser(description="Parses the chocolate category of the Metro store")
+arg_parser.add_argument("--format", choices=("parquet", "csv"), default="parquet", help="Output file format")
+args = arg_parser.parse_args()
+
 cities = ["Москва", "Санкт-Петербург"]
-for city in cities:
-    df = pd.DataFrame(data=parser.parse_chocolate_category(city=city))
-    df.to_csv(f"{city}.csv", index=False)
-    print(df)
+schema = pa.schema([(field, pa.string()) for field in MetroParser.PRODUCT_FIELDS])
+with MetroParser() as parser:
+    for city in cities:
+        products = parser.parse_chocolate_category(city=city)
+        if args.format == "csv":
+            with open(f"{city}.csv", "w", newline="", encoding="utf-8") as file:
+                writer = csv.DictWriter(file, fieldnames=MetroParser.PRODUCT_FIELDS)
+                writer.writeheader()
+                writer.writerows(products)
+            print(f"Saved {len(products)} products to {city}.csv")
+        else:
+            table = pa.Table.from_pylist(products, schema=schema)
+            pq.write_table(table, f"{city}.parquet", compression="zstd")
+            print(table)
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
@@ -11,6 +12,7 @@ class Settings(BaseSettings):
         env_file = '.env'
 
     WEBDRIVER: str = os.getenv("WEBDRIVER")
+    DRIVER_PATH: str = os.getenv("DRIVER_PATH")
     LOAD_STRATEGY: str = os.getenv("LOAD_STRATEGY")
     WINDOW_SIZE: str = os.getenv("WINDOW_SIZE")
     DISABLE_CACHE: bool = os.getenv("DISABLE_CACHE")
@@ -19,6 +21,18 @@ class Settings(BaseSettings):
     HEADLESS: bool = os.getenv("HEADLESS")
     DISABLE_BLINK_FEATURES: str = os.getenv("DISABLE_BLINK_FEATURES")
     USER_AGENT: str = os.getenv("USER_AGENT")
+    PRODUCT_FETCHER: str = os.getenv("PRODUCT_FETCHER")
 
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings(_env_file: str = '') -> Settings:
+    """
+    Returns the settings loaded from the specified environment file, creating them only once per file.
+
+    Args:
+        _env_file (str, optional): Path to the environment file. Defaults to ''.
+
+    Returns:
+        Settings: The settings.
+    """
+    return Settings(_env_file=_env_file)
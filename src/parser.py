@@ -1,56 +1,45 @@
-from functools import lru_cache, wraps
-from time import sleep
-from typing import List
-
+import json
+import os
+import time
+from email.utils import parsedate_to_datetime
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession, create_key
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
-from selenium.common import NoSuchElementException
+from selenium.common import (
+    NoSuchElementException,
+    SessionNotCreatedException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.core.os_manager import ChromeType
 from webdriver_manager.firefox import GeckoDriverManager
 
-from .config import Settings
+from .config import get_settings
 from .logger import logger
 from .utils import retry
 
 
-def open_new_window(func):
+class ClientError(requests.HTTPError):
     """
-    A decorator that opens a new browser window before
-    the decorated function is called and closes it after the function completes.
-
-    This decorator is useful for functions that need to perform
-    operations in a new window, such as navigating to a link,
-    extracting data, and then closing the window.
-    It ensures that the window management logic is encapsulated within the decorator,
-    making the decorated function cleaner and more focused on its specific task.
-
-    Args:
-        func (function): The function to be decorated. This function should accept at least two parameters:
-            - `self`: The instance of the class that the function belongs to.
-            - `driver`: An instance of Selenium WebDriver.
-            - `link`: The URL to navigate to in the new window.
-
-    Returns:
-        function: The decorated function.
+    An HTTP error caused by the request itself, such as 403 Forbidden, which will not succeed if retried.
     """
-    @wraps(func)
-    def wrapper(self, driver: WebDriver, link: str, *args, **kwargs):
-        logger.info(f"Opening new window for link: {link}")
-        driver.execute_script("window.open('');")
-        driver.switch_to.window(driver.window_handles[1])
-
-        try:
-            return func(self, driver, link, *args, **kwargs)
-        finally:
-            logger.info("Closing the new window")
-            driver.close()
-            driver.switch_to.window(driver.window_handles[0])
-
-    return wrapper
 
 
 class MetroParser:
@@ -59,37 +48,103 @@ class MetroParser:
 
     Methods:
         __init__(self, _env_file: str = '') -> None: Initializes the MetroParser with the specified environment file.
+        __enter__(self) -> MetroParser: Initializes the web driver shared by all parsed cities.
+        __exit__(self, *args) -> None: Quits the shared web driver.
+        get_driver_path(self, webdriver_name: str, reinstall: bool = False) -> str: Returns the web driver path,
+            installing it if needed.
         initialize_driver(self) -> WebDriver: Initializes and configures the web browser driver.
-        select_address_in_city(self, driver: WebDriver, city: str) -> None: Selects the first address in the city.
-        scrape_price(text: str) -> str: Static method to extract price information from a given text.
-        get_item_data(self, driver: WebDriver, link: str) -> dict: Retrieves item data for a given product link.
-        scroll_to_the_bottom(self, driver: WebDriver) -> None: Scrolls to the bottom of the page to load more items.
+        block_unnecessary_resources(self, driver: WebDriver) -> None: Blocks requests not needed for parsing
+            in the current tab.
+        get_driver(self) -> WebDriver: Returns the shared web driver, initializing it if needed.
+        close(self) -> None: Quits the shared web driver.
+        select_address_in_city(self, driver: WebDriver, wait: WebDriverWait, city: str) -> None: Selects the first
+            address in the city.
+        create_cache_key(city: str, request: requests.PreparedRequest, **kwargs) -> str: Creates an HTTP cache key.
+        create_session(self, driver: WebDriver, city: str) -> requests.Session: Creates a cached HTTP session
+            sharing the driver's cookies.
+        scrape_prices(texts: pa.Array) -> pa.StringArray: Static method to extract prices from a column of texts.
+        scrape_products_prices(self, products: List[dict]) -> List[dict]: Extracts prices of all products at once.
+        select_text(tree: LexborHTMLParser, selector: str, index: int = 0) -> str: Extracts the text of a matched node.
+        select_element_text(driver: WebDriver, selector: str, index: int = 0) -> str: Extracts the text
+            of a matched element on the current page.
+        extract_product_data(self, select: Callable[..., str], link: str) -> dict: Extracts item data from a page.
+        parse_retry_after(value: Optional[str]) -> Optional[float]: Parses the Retry-After header value.
+        request_product_page(self, session: requests.Session, link: str) -> LexborHTMLParser: Requests and parses
+            the product page.
+        get_product_data(self, session: requests.Session, city: str, link: str) -> dict: Retrieves item data
+            for a given product link.
+        get_products_data_in_tabs(self, driver: WebDriver, wait: WebDriverWait, city: str, links: List[str])
+            -> Dict[str, dict]:
+            Retrieves item data for the given product links using a pool of browser tabs.
+        collect_product_items(self, driver: WebDriver) -> List[dict]: Collects product links and sold out flags.
+        get_products_data(self, driver: WebDriver, wait: WebDriverWait, session: requests.Session, city: str,
+            product_items: List[dict]) -> List[dict]: Retrieves product data for a list of product cards.
+        scroll_to_the_bottom(self, driver: WebDriver, wait: WebDriverWait) -> None: Scrolls to the bottom of the page
+            to load more items.
         parse_chocolate_category(self, city: str) -> List[dict]: Parses the chocolate category for the specified city.
     """
     HOST = "https://online.metro-cc.ru/"
-    ADDRESS_BTN = (By.XPATH, "(//button[contains(@class, 'header-address__receive-button')])")
-    SHOW_MORE = (By.XPATH, "(//button[contains(@class, 'subcategory-or-type__load-more')])")
+    ADDRESS_BTN = (By.CSS_SELECTOR, "button.header-address__receive-button")
+    SHOW_MORE = (By.CSS_SELECTOR, "button.subcategory-or-type__load-more")
     PICKUP_BTN = (By.XPATH, "(//div[contains(@class, 'delivery__tab')])[3]")
-    RESET_BTN = (By.XPATH, "(//span[contains(@class, 'reset-link')])")
-    CITY_INPUT = (By.XPATH, "(//input[contains(@label, 'Введите название города')])")
-    CITY_ITEM = (By.XPATH, "(//div[contains(@class, 'city-item')])")
+    RESET_BTN = (By.CSS_SELECTOR, "span.reset-link")
+    CITY_INPUT = (By.CSS_SELECTOR, "input[label*='Введите название города']")
+    CITY_ITEM = "//div[contains(concat(' ', normalize-space(@class), ' '), ' city-item ')][contains(., '{city}')]"
     SELECT_BTN = (By.XPATH, "(//button[contains(@type, 'button')])/span[contains(., 'Выбрать')]")
-    PRODUCT_ITEM = (By.XPATH, "(//div[contains(@class, 'subcategory-or-type__products-item')])")
-    PRODUCT_PHOTO_ITEM = (By.XPATH, "(//a[contains(@class, 'product-card-photo__link')])")
-    PRODUCT_ARTICLE = (By.XPATH, "(//p[contains(@itemprop, 'productID')])")
-    PRODUCT_ITEM_NAME = (By.XPATH, "(//h1[contains(@class, 'product-page-content__product-name')])")
-    PRODUCT_ITEM_PROMO_PRICE = (By.XPATH, "(//div[contains(@class, 'product-unit-prices__actual-wrapper')])")
-    PRODUCT_ITEM_REGULAR_PRICE = (By.XPATH, "(//div[contains(@class, 'product-unit-prices__old-wrapper')])")
-    PRODUCT_BRAND_NAME = (By.XPATH, "(//a[contains(@class, 'product-attributes__list-item')])[4]")
+    PRODUCT_ITEM = (By.CSS_SELECTOR, "div.subcategory-or-type__products-item")
+    PRODUCT_PHOTO_ITEM = (By.CSS_SELECTOR, "a.product-card-photo__link")
+    PRODUCT_ARTICLE = "p[itemprop=productID]"
+    PRODUCT_ITEM_NAME = "h1.product-page-content__product-name"
+    PRODUCT_ITEM_PROMO_PRICE = "div.product-unit-prices__actual-wrapper"
+    PRODUCT_ITEM_REGULAR_PRICE = "div.product-unit-prices__old-wrapper"
+    PRODUCT_BRAND_NAME = "a.product-attributes__list-item"
+    PRODUCT_BRAND_NAME_INDEX = 3
+    PRODUCT_FIELDS = ("id", "name", "link", "regular_price", "promo_price", "brand_name")
+    SOLD_OUT_TEXT = "Раскупили"
+    COLLECT_PRODUCTS_SCRIPT = """
+        const [itemSelector, photoSelector, soldOutText] = arguments;
+        const products = [];
+        for (const item of document.querySelectorAll(itemSelector)) {
+            const photo = item.querySelector(photoSelector);
+            if (!photo || !photo.href) {
+                continue;
+            }
+            products.push({link: photo.href, sold_out: item.innerText.includes(soldOutText)});
+        }
+        return products;
+    """
+    NAVIGATE_SCRIPT = "window.metroParserNavigating = true; window.location.href = arguments[0];"
+    PAGE_LOADED_SCRIPT = "return !window.metroParserNavigating && document.readyState !== 'loading';"
+    LOAD_STRATEGIES = ("eager", "none")
+    WAIT_TIMEOUT = 10
+    REQUEST_TIMEOUT = 10
+    MAX_WORKERS = 16
+    BROWSER_TABS = 4
+    BLOCKED_URLS = [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.webm",
+        "*google-analytics.com*", "*googletagmanager.com*", "*mc.yandex.ru*", "*top-fwz1.mail.ru*",
+    ]
+    CACHE_NAME = "metro_cache"
+    CACHE_EXPIRE_AFTER = 3600
+    DRIVER_PATHS_FILE = ".driver_paths.json"
+    DRIVER_PATHS_EXPIRE_AFTER = 86400
+
+    _driver_paths: Dict[str, str] = {}
 
     def __init__(self, _env_file: str = '') -> None:
         """
         Initializes the MetroParser.
 
+        The web driver path is resolved once per driver type and reused by all MetroParser instances.
+        The browser itself is started lazily on the first parsed city.
+        The page load strategy is "eager" unless it is set to "none", so navigation does not wait
+        for the full page load, and the required elements are waited for explicitly.
+
         Args:
             _env_file (str, optional): Path to the environment file. Defaults to ''.
         """
-        settings = Settings(_env_file=_env_file)
+        settings = get_settings(_env_file)
 
         if settings.WEBDRIVER == "CHROMIUM":
             self.DriverManager = ChromeDriverManager(chrome_type=ChromeType.CHROMIUM)
@@ -104,12 +159,21 @@ class MetroParser:
             self.options = webdriver.FirefoxOptions()
             self.web_driver = webdriver.Firefox
 
-        self.service = Service(executable_path=self.DriverManager.install())
+        self.webdriver_name = settings.WEBDRIVER
+        self.is_driver_path_pinned = bool(settings.DRIVER_PATH)
+        if settings.WEBDRIVER not in self._driver_paths:
+            self._driver_paths[settings.WEBDRIVER] = settings.DRIVER_PATH or self.get_driver_path(settings.WEBDRIVER)
+        self.service = Service(executable_path=self._driver_paths[settings.WEBDRIVER])
+        self.driver: Optional[WebDriver] = None
+        self._product_cache: Dict[Tuple[str, str], dict] = {}
+        self.product_fetcher = settings.PRODUCT_FETCHER
 
         self.options.add_argument(f"--disable-blink-features={settings.DISABLE_BLINK_FEATURES}")
         self.options.add_argument(f"--user-agent={settings.USER_AGENT}")
         self.options.add_argument(f"--window-size={settings.WINDOW_SIZE}")
-        self.options.page_load_strategy = settings.LOAD_STRATEGY
+        self.options.page_load_strategy = (
+            settings.LOAD_STRATEGY if settings.LOAD_STRATEGY in self.LOAD_STRATEGIES else self.LOAD_STRATEGIES[0]
+        )
         if settings.NO_SANDBOX:
             self.options.add_argument(f"--no-sandbox")
         if settings.DISABLE_DEV_SHM_USAGE:
@@ -118,152 +182,607 @@ class MetroParser:
             self.options.add_argument("--headless")
         if settings.DISABLE_CACHE:
             self.options.add_argument("--disable-cache")
+        if isinstance(self.options, webdriver.ChromeOptions):
+            self.options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    def get_driver_path(self, webdriver_name: str, reinstall: bool = False) -> str:
+        """
+        Returns the path of the web driver, installing it only if there is no fresh path saved on the disk.
+
+        The driver manager checks for driver updates online on every install, so the installed path
+        is saved to `DRIVER_PATHS_FILE` and reused by the following runs for `DRIVER_PATHS_EXPIRE_AFTER` seconds.
+        Malformed saved entries are ignored.
+
+        Args:
+            webdriver_name (str): The name of the web driver type.
+            reinstall (bool, optional): Whether to ignore the saved path and install the driver again,
+                                        e.g. after the browser was updated. Defaults to False.
+
+        Returns:
+            str: The path of the web driver executable.
+        """
+        try:
+            with open(self.DRIVER_PATHS_FILE, encoding="utf-8") as file:
+                driver_paths = json.load(file)
+        except (OSError, ValueError):
+            driver_paths = {}
+        if not isinstance(driver_paths, dict):
+            driver_paths = {}
+
+        saved = driver_paths.get(webdriver_name)
+        is_valid = (
+            not reinstall
+            and isinstance(saved, dict)
+            and isinstance(saved.get("path"), str)
+            and isinstance(saved.get("saved_at"), (int, float))
+        )
+        is_fresh = is_valid and time.time() - saved["saved_at"] < self.DRIVER_PATHS_EXPIRE_AFTER
+        if is_fresh and os.path.exists(saved["path"]):
+            logger.info(f"Using saved web driver path: {saved['path']}")
+            return saved["path"]
+
+        logger.info("Installing web driver")
+        path = self.DriverManager.install()
+        driver_paths[webdriver_name] = {"path": path, "saved_at": time.time()}
+        try:
+            with open(self.DRIVER_PATHS_FILE, "w", encoding="utf-8") as file:
+                json.dump(driver_paths, file)
+        except OSError as exc:
+            logger.error(f"Failed to save web driver path: {str(exc)}")
+        return path
 
     def initialize_driver(self) -> WebDriver:
         """
         Initializes and configures the web browser driver.
 
+        If the session cannot be created with a saved driver path, e.g. because the browser was updated
+        and no longer matches the driver, the driver is installed again and the session is created once more.
+
         Returns:
             WebDriver: The configured web driver.
         """
         logger.info("Initializing web driver")
-        driver = self.web_driver(service=self.service, options=self.options)
+        try:
+            driver = self.web_driver(service=self.service, options=self.options)
+        except SessionNotCreatedException:
+            if self.is_driver_path_pinned:
+                raise
+            logger.info("Failed to create a session with the saved web driver, reinstalling it")
+            self._driver_paths[self.webdriver_name] = self.get_driver_path(self.webdriver_name, reinstall=True)
+            self.service = Service(executable_path=self._driver_paths[self.webdriver_name])
+            driver = self.web_driver(service=self.service, options=self.options)
+        self.block_unnecessary_resources(driver)
         logger.info("Web driver initialized successfully")
         return driver
 
-    def select_address_in_city(self, driver: WebDriver, city: str) -> None:
+    def block_unnecessary_resources(self, driver: WebDriver) -> None:
+        """
+        Blocks images, fonts, media and analytics requests in the current tab, since none of them
+        are needed to parse the products.
+
+        The requests are blocked through the DevTools protocol, which is only supported by Chromium based
+        drivers and only affects the current tab, so it has to be called for every newly opened tab.
+
+        Args:
+            driver (WebDriver): The web driver instance.
+        """
+        if isinstance(driver, ChromiumDriver):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URLS})
+            logger.info("Blocked unnecessary resources")
+
+    def get_driver(self) -> WebDriver:
+        """
+        Returns the web driver shared by all parsed cities, initializing it if needed.
+
+        The driver is also quit when the parser is garbage collected or the interpreter exits,
+        so the browser does not outlive a parser used without the context manager.
+
+        Returns:
+            WebDriver: The shared web driver.
+        """
+        if self.driver is None:
+            self.driver = self.initialize_driver()
+            self._driver_finalizer = weakref.finalize(self, self.driver.quit)
+        return self.driver
+
+    def close(self) -> None:
+        """
+        Quits the shared web driver if it is initialized.
+
+        The driver is dropped even if quitting fails, e.g. because its session is already dead,
+        so the next call of `get_driver` initializes a new one.
+        """
+        if self.driver is not None:
+            logger.info("Quitting web driver")
+            self.driver = None
+            try:
+                self._driver_finalizer()
+            except Exception as exc:
+                logger.error(f"Failed to quit web driver: {str(exc)}")
+
+    def __enter__(self) -> "MetroParser":
+        """
+        Initializes the web driver shared by all cities parsed within the context.
+
+        Returns:
+            MetroParser: The parser instance.
+        """
+        self.get_driver()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Quits the shared web driver when leaving the context.
+        """
+        self.close()
+
+    def select_address_in_city(self, driver: WebDriver, wait: WebDriverWait, city: str) -> None:
         """
         Selects the first address in the specified city.
 
+        It waits for a city item containing the city name, so a stale search result is never clicked,
+        and after the selection it waits until the page reloads with the selected store: a product card
+        from before the selection becomes stale or the header address changes.
+
         Args:
             driver (WebDriver): The web driver instance.
+            wait (WebDriverWait): The explicit wait of the web driver.
             city (str): The city name.
         """
         logger.info(f"Selecting address in city: {city}")
-        driver.find_element(*self.ADDRESS_BTN).click()
+        product_items = driver.find_elements(*self.PRODUCT_ITEM)
+
+        address_btn = wait.until(EC.element_to_be_clickable(self.ADDRESS_BTN))
+        address = address_btn.text
+        address_btn.click()
         logger.info("Address button clicked")
 
-        driver.find_element(*self.PICKUP_BTN).click()
+        wait.until(EC.element_to_be_clickable(self.PICKUP_BTN)).click()
         logger.info("Pickup button clicked")
 
-        driver.find_element(*self.RESET_BTN).click()
+        wait.until(EC.element_to_be_clickable(self.RESET_BTN)).click()
         logger.info("Reset button clicked")
 
-        driver.find_element(*self.CITY_INPUT).send_keys(city)
+        wait.until(EC.element_to_be_clickable(self.CITY_INPUT)).send_keys(city)
         logger.info(f"City input: {city}")
 
-        sleep(2)
-        driver.find_element(*self.CITY_ITEM).click()
+        city_item = (By.XPATH, self.CITY_ITEM.format(city=city))
+        wait.until(EC.element_to_be_clickable(city_item)).click()
         logger.info("City item clicked")
 
-        sleep(1)
-        driver.find_element(*self.SELECT_BTN).click()
+        wait.until(EC.element_to_be_clickable(self.SELECT_BTN)).click()
         logger.info("Select button clicked")
 
-        sleep(3)
+        store_applied = [lambda d: d.find_element(*self.ADDRESS_BTN).text != address]
+        if product_items:
+            store_applied.append(EC.staleness_of(product_items[0]))
+        wait.until(EC.any_of(*store_applied))
         logger.info("Address selection completed")
 
     @staticmethod
-    def scrape_price(text: str) -> str:
+    def create_cache_key(city: str, request: requests.PreparedRequest, **kwargs) -> str:
         """
-        Static method to extract price information from a given text.
+        Static method to create an HTTP cache key for a request made in the specified city.
+
+        Prices depend on the selected store, so the same product page is cached separately for each city.
+        The session cookies are not a part of the key, so cached pages survive between runs.
 
         Args:
-            text (str): The text containing the price information.
+            city (str): The city name.
+            request (requests.PreparedRequest): The request to create the key for.
+            **kwargs: Additional arguments passed to `requests_cache.create_key`.
 
         Returns:
-            str: The extracted price.
+            str: The cache key.
         """
-        return text.replace(" ", "").split("д")[0]
+        return f"{city}:{create_key(request, **kwargs)}"
 
-    @lru_cache(maxsize=None)
-    @retry(tries=10, log=True)
-    @open_new_window
-    def get_product_data(self, driver: WebDriver, link: str) -> dict:
+    def create_session(self, driver: WebDriver, city: str) -> requests.Session:
         """
-        Retrieves item data for a given product link.
+        Creates a cached HTTP session that shares cookies and the user agent with the web driver.
+
+        The selected address is stored in the browser cookies,
+        so product pages requested through this session show the prices of the selected store.
+        The connection pool is sized to the number of workers, so that parallel requests reuse connections.
+
+        Successful responses are stored in an SQLite cache for `CACHE_EXPIRE_AFTER` seconds,
+        so repeated runs read product pages from the disk. Expired responses with an ETag or Last-Modified
+        header are revalidated with a conditional request, and a 304 response renews the cached page.
+        The session should be closed after use to release the cache connection and the connection pool.
 
         Args:
             driver (WebDriver): The web driver instance.
-            link (str): The product link.
+            city (str): The city name the address was selected in.
 
         Returns:
-            dict: The item data.
+            requests.Session: The configured HTTP session.
+        """
+        logger.info("Creating HTTP session from the web driver cookies")
+        session = CachedSession(
+            self.CACHE_NAME,
+            backend="sqlite",
+            expire_after=self.CACHE_EXPIRE_AFTER,
+            allowable_codes=(200,),
+            key_fn=partial(self.create_cache_key, city),
+        )
+        adapter = HTTPAdapter(pool_connections=self.MAX_WORKERS, pool_maxsize=self.MAX_WORKERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        for cookie in driver.get_cookies():
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+            )
+        return session
+
+    @staticmethod
+    def scrape_prices(texts: pa.Array) -> pa.StringArray:
+        """
+        Static method to extract price information from a column of texts.
+
+        Args:
+            texts (pa.Array): The texts containing the price information.
+
+        Returns:
+            pa.StringArray: The extracted prices.
+        """
+        texts = pc.replace_substring(texts, pattern=" ", replacement="")
+        return pc.list_element(pc.split_pattern(texts, pattern="д", max_splits=1), 0)
+
+    def scrape_products_prices(self, products: List[dict]) -> List[dict]:
+        """
+        Extracts the regular and the promo prices of all products in a single vectorized pass.
+
+        The regular price falls back to the promo price if the product has no discount.
+
+        Args:
+            products (List[dict]): A list of dictionaries containing the product data with raw price texts.
+
+        Returns:
+            List[dict]: A list of dictionaries containing the product data with extracted prices.
+        """
+        if not products:
+            return []
+
+        table = pa.Table.from_pylist(products)
+        promo_prices = self.scrape_prices(table["promo_price"])
+        regular_prices = self.scrape_prices(table["regular_price"])
+        regular_prices = pc.if_else(pc.equal(regular_prices, ""), promo_prices, regular_prices)
+
+        table = table.set_column(table.column_names.index("regular_price"), "regular_price", regular_prices)
+        table = table.set_column(table.column_names.index("promo_price"), "promo_price", promo_prices)
+        return table.to_pylist()
+
+    @staticmethod
+    def select_text(tree: LexborHTMLParser, selector: str, index: int = 0) -> str:
+        """
+        Static method to extract the text of a node matched by a CSS selector.
+
+        Args:
+            tree (LexborHTMLParser): The parsed HTML page.
+            selector (str): The CSS selector.
+            index (int, optional): The index of the node among all matched nodes. Defaults to 0.
+
+        Returns:
+            str: The node text with non-breaking spaces replaced by regular ones.
+
+        Raises:
+            NoSuchElementException: If there is no matched node with the given index.
+        """
+        nodes = tree.css(selector)
+        if len(nodes) <= index:
+            raise NoSuchElementException(f"Unable to locate element: {selector}")
+        return nodes[index].text(separator=" ").replace("\xa0", " ")
+
+    @staticmethod
+    def select_element_text(driver: WebDriver, selector: str, index: int = 0) -> str:
+        """
+        Static method to extract the text of an element on the current page matched by a CSS selector.
+
+        Args:
+            driver (WebDriver): The web driver instance.
+            selector (str): The CSS selector.
+            index (int, optional): The index of the element among all matched elements. Defaults to 0.
+
+        Returns:
+            str: The element text.
+
+        Raises:
+            NoSuchElementException: If there is no matched element with the given index.
+        """
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        if len(elements) <= index:
+            raise NoSuchElementException(f"Unable to locate element: {selector}")
+        return elements[index].text
+
+    def extract_product_data(self, select: Callable[..., str], link: str) -> dict:
         """
-        logger.info(f"Navigating to link: {link}")
-        driver.get(link)
+        Extracts item data from a product page.
 
+        Args:
+            select (Callable[..., str]): A function that returns the text of the node matched by a CSS selector
+                                         and an optional index, such as a partial of `select_text`.
+            link (str): The product link.
+
+        Returns:
+            dict: The item data, or an empty dict if the product is out of stock.
+        """
         try:
             logger.info("Extracting item data")
             data = {
-                "id": driver.find_element(*self.PRODUCT_ARTICLE).text.split(':')[-1].strip(),
-                "name": driver.find_element(*self.PRODUCT_ITEM_NAME).text.strip(),
+                "id": select(self.PRODUCT_ARTICLE).split(':')[-1].strip(),
+                "name": select(self.PRODUCT_ITEM_NAME).strip(),
                 "link": link,
-                "regular_price": self.scrape_price(driver.find_element(*self.PRODUCT_ITEM_REGULAR_PRICE).text),
-                "promo_price": self.scrape_price(driver.find_element(*self.PRODUCT_ITEM_PROMO_PRICE).text),
-                "brand_name": driver.find_element(*self.PRODUCT_BRAND_NAME).text.strip(),
+                "regular_price": select(self.PRODUCT_ITEM_REGULAR_PRICE),
+                "promo_price": select(self.PRODUCT_ITEM_PROMO_PRICE),
+                "brand_name": select(self.PRODUCT_BRAND_NAME, self.PRODUCT_BRAND_NAME_INDEX).strip(),
             }
-            if not data.get("regular_price"):
-                data["regular_price"] = data["promo_price"]
             logger.info(f"Item data extracted: {data}")
             return data
         except NoSuchElementException:
             logger.info("The product is out of stock")
             return {}
 
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Static method to parse the Retry-After header value.
+
+        Args:
+            value (Optional[str]): The header value, either a number of seconds or an HTTP date.
+
+        Returns:
+            Optional[float]: The number of seconds to wait, or None if the value is missing or malformed.
+        """
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @retry(tries=10, delay=1, exceptions=requests.RequestException, stop_exceptions=(ValueError, ClientError), log=True)
+    def request_product_page(self, session: requests.Session, link: str) -> LexborHTMLParser:
+        """
+        Requests and parses the product page.
+
+        Failed requests are retried with an exponential backoff starting at one second. A 429 response
+        is retried after the delay from its Retry-After header, if it is longer. Malformed requests,
+        such as an invalid link, and other 4xx responses, such as 403, are raised immediately.
+        A missing or removed page (404 or 410) is parsed as well, so the product is treated as out of stock.
+
+        Args:
+            session (requests.Session): The HTTP session with the selected address cookies.
+            link (str): The product link.
+
+        Returns:
+            LexborHTMLParser: The parsed product page.
+        """
+        logger.info(f"Requesting link: {link}")
+        response = session.get(link, timeout=self.REQUEST_TIMEOUT)
+        if response.status_code in (404, 410):
+            return LexborHTMLParser(response.text)
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as exc:
+            if response.status_code == 429:
+                exc.retry_after = self.parse_retry_after(response.headers.get("Retry-After"))
+                raise
+            if 400 <= response.status_code < 500:
+                raise ClientError(str(exc), response=response) from exc
+            raise
+        return LexborHTMLParser(response.text)
+
+    def get_product_data(self, session: requests.Session, city: str, link: str) -> dict:
+        """
+        Retrieves item data for a given product link.
+
+        The prices are returned as raw texts, they are extracted later for all products at once.
+        The data is cached by the city and the link, since prices depend on the selected store.
+        The cache is checked before the page is requested, and only the request itself is retried.
+
+        Args:
+            session (requests.Session): The HTTP session with the selected address cookies.
+            city (str): The city name the address was selected in.
+            link (str): The product link.
+
+        Returns:
+            dict: The item data.
+        """
+        if (city, link) in self._product_cache:
+            logger.info(f"Using cached item data for link: {link}")
+            return self._product_cache[city, link]
+
+        tree = self.request_product_page(session, link)
+        data = self.extract_product_data(partial(self.select_text, tree), link)
+
+        self._product_cache[city, link] = data
+        return data
+
+    def get_products_data_in_tabs(
+            self, driver: WebDriver,
+            wait: WebDriverWait,
+            city: str,
+            links: List[str]
+    ) -> Dict[str, dict]:
+        """
+        Retrieves item data for the given product links using a pool of browser tabs.
+
+        The web driver can only be used by one thread at a time, so the parallelism comes from the browser:
+        up to `BROWSER_TABS` tabs start loading their links at once, and then the data is extracted
+        from each tab in turn. A tab is loaded once its document is replaced by the navigation, which also
+        works for links redirected to the same page. The data is cached by the city and the link,
+        like in `get_product_data`, except for tabs that do not load in time, which are treated
+        as out of stock products.
+
+        Args:
+            driver (WebDriver): The web driver instance.
+            wait (WebDriverWait): The explicit wait of the web driver.
+            city (str): The city name the address was selected in.
+            links (List[str]): The product links.
+
+        Returns:
+            Dict[str, dict]: The item data of each link.
+        """
+        pages_data = {link: self._product_cache[city, link] for link in links if (city, link) in self._product_cache}
+        pending = [link for link in dict.fromkeys(links) if link not in pages_data]
+        if not pending:
+            return pages_data
+
+        main_window = driver.current_window_handle
+        tabs = []
+        try:
+            for _ in range(min(self.BROWSER_TABS, len(pending))):
+                driver.switch_to.new_window("tab")
+                tabs.append(driver.current_window_handle)
+                self.block_unnecessary_resources(driver)
+            logger.info(f"Opened {len(tabs)} tabs for {len(pending)} products")
+
+            for start in range(0, len(pending), len(tabs)):
+                batch = list(zip(tabs, pending[start:start + len(tabs)]))
+                for tab, link in batch:
+                    logger.info(f"Navigating tab to link: {link}")
+                    driver.switch_to.window(tab)
+                    driver.execute_script(self.NAVIGATE_SCRIPT, link)
+
+                for tab, link in batch:
+                    driver.switch_to.window(tab)
+                    try:
+                        wait.until(lambda d: d.execute_script(self.PAGE_LOADED_SCRIPT))
+                    except TimeoutException:
+                        logger.info(f"Timed out loading link: {link}")
+                        pages_data[link] = {}
+                        continue
+
+                    try:
+                        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, self.PRODUCT_ARTICLE)))
+                    except TimeoutException:
+                        logger.info(f"Product article not found on link: {link}")
+
+                    data = self.extract_product_data(partial(self.select_element_text, driver), link)
+                    self._product_cache[city, link] = pages_data[link] = data
+        finally:
+            logger.info("Closing the tabs")
+            for tab in tabs:
+                try:
+                    driver.switch_to.window(tab)
+                    driver.close()
+                except WebDriverException as exc:
+                    logger.error(f"Failed to close the tab: {str(exc)}")
+            try:
+                driver.switch_to.window(main_window)
+            except WebDriverException as exc:
+                logger.error(f"Failed to switch to the main window: {str(exc)}")
+
+        return pages_data
+
+    def collect_product_items(self, driver: WebDriver) -> List[dict]:
+        """
+        Collects the link and the sold out flag of every product card on the page.
+
+        The cards are traversed once by a single script in the browser. For each card it takes the link
+        from the photo link inside the card, skipping cards without it, and checks if the card is marked
+        as "Раскупили" (sold out).
+
+        Args:
+            driver (WebDriver): The web driver instance.
+
+        Returns:
+            List[dict]: A list of dictionaries with the "link" and the "sold_out" flag of each product card.
+        """
+        logger.info("Collecting product cards")
+        return driver.execute_script(
+            self.COLLECT_PRODUCTS_SCRIPT,
+            self.PRODUCT_ITEM[1],
+            self.PRODUCT_PHOTO_ITEM[1],
+            self.SOLD_OUT_TEXT,
+        )
+
     def get_products_data(
             self, driver: WebDriver,
-            product_items: List[WebElement],
-            product_photo_items: List[WebElement]
+            wait: WebDriverWait,
+            session: requests.Session,
+            city: str,
+            product_items: List[dict]
     ) -> List[dict]:
         """
-        Retrieves product data for a list of product items and their corresponding photo items.
+        Retrieves product data for a list of product cards.
 
-        This method iterates over pairs of product items and their photo items, extracts the product link,
-        and checks if the product is not marked as "Раскупили" (sold out). If the product is available,
-        it retrieves the product data using the `get_product_data` method and appends it to the `products` list.
+        Sold out products are skipped without requesting their pages, and all fields of the other products
+        are taken from their pages. The pages are requested in parallel using the `get_product_data` method,
+        or loaded in a pool of browser tabs using the `get_products_data_in_tabs` method if the product fetcher
+        is "BROWSER".
+        The order of the product cards is preserved, and the prices of all products are extracted in a single pass.
 
         Args:
-            driver (WebDriver): The Selenium WebDriver instance used for browser automation.
-            product_items (List[WebElement]): A list of WebElement instances representing product items.
-            product_photo_items (List[WebElement]): A list of WebElement instances representing product photo items.
-                                                    It is only used to get a link to the product
+            driver (WebDriver): The web driver instance.
+            wait (WebDriverWait): The explicit wait of the web driver.
+            session (requests.Session): The HTTP session used to request product pages.
+            city (str): The city name the address was selected in.
+            product_items (List[dict]): A list of dictionaries with the data of each product card.
 
         Returns:
             List[dict]: A list of dictionaries containing the product data for each available product.
         """
-        products = []
-        for item, photo_item in zip(product_items, product_photo_items):
-            link = photo_item.get_attribute("href")
-            if "Раскупили" not in item.text:
-                data = self.get_product_data(driver, link)
-                if data:
-                    products.append(data)
+        links = [item["link"] for item in product_items if not item["sold_out"]]
 
-        return products
+        if self.product_fetcher == "BROWSER":
+            logger.info(f"Retrieving data of {len(links)} products in {self.BROWSER_TABS} tabs")
+            pages_data = self.get_products_data_in_tabs(driver, wait, city, links)
+        else:
+            logger.info(f"Retrieving data of {len(links)} products in {self.MAX_WORKERS} threads")
+            with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                pages_data = dict(zip(links, executor.map(partial(self.get_product_data, session, city), links)))
+
+        products = [
+            {field: pages_data[link][field] for field in self.PRODUCT_FIELDS} for link in links if pages_data[link]
+        ]
+
+        return self.scrape_products_prices(products)
 
-    def scroll_to_the_bottom(self, driver: WebDriver) -> None:
+    def scroll_to_the_bottom(self, driver: WebDriver, wait: WebDriverWait) -> None:
         """
         Scrolls to the bottom of the page to load more items.
 
+        After each click on the 'Show More' button it waits until the number of product items increases.
+        Scrolling is complete when the button is gone or a click adds no items within the wait timeout.
+
         Args:
             driver (WebDriver): The web driver instance.
+            wait (WebDriverWait): The explicit wait of the web driver.
         """
         logger.info("Starting to scroll to the bottom of the page")
+        wait.until(EC.presence_of_element_located(self.PRODUCT_ITEM))
         while True:
-            try:
-                logger.info("Attempting to click 'Show More' button")
-                driver.find_element(*self.SHOW_MORE).click()
-                sleep(3)
-            except NoSuchElementException:
+            show_more = driver.find_elements(*self.SHOW_MORE)
+            if not show_more:
                 logger.info("'Show More' button not found, scrolling complete")
                 break
 
-    @retry(tries=10, log=True)
+            logger.info("Clicking 'Show More' button")
+            count = len(driver.find_elements(*self.PRODUCT_ITEM))
+            show_more[0].click()
+            try:
+                wait.until(lambda d: len(d.find_elements(*self.PRODUCT_ITEM)) > count)
+            except TimeoutException:
+                logger.info("No more products loaded, scrolling complete")
+                break
+
+    @retry(tries=10, delay=1, log=True)
     def parse_chocolate_category(self, city: str) -> List[dict]:
         """
         Parses the chocolate category for the specified city.
 
+        The shared web driver is reused between cities, only the address is selected again.
+        If the driver fails or the connection to it is lost, it is dropped and reinitialized on the next attempt.
+
         Args:
             city (str): The city name.
 
@@ -271,22 +790,28 @@ class MetroParser:
             List[dict]: A list of dictionaries containing product data.
         """
         logger.info(f"Starting to parse chocolate category for city: {city}")
-        with self.initialize_driver() as driver:
+        driver = self.get_driver()
+        try:
             logger.info("Navigating to chocolate category page")
             driver.get("https://online.metro-cc.ru/category/sladosti-chipsy-sneki/shokolad-batonchiki")
-            driver.implicitly_wait(6)
+            driver.implicitly_wait(0)
+            wait = WebDriverWait(driver, self.WAIT_TIMEOUT)
 
             logger.info(f"Selecting the first turned up address in city: {city}")
-            self.select_address_in_city(driver, city)
+            self.select_address_in_city(driver, wait, city)
 
             logger.info("Scrolling to the bottom of the page")
-            self.scroll_to_the_bottom(driver)
+            self.scroll_to_the_bottom(driver, wait)
 
             logger.info("Finding products")
-            products = driver.find_elements(*self.PRODUCT_ITEM)
-            product_photos = driver.find_elements(*self.PRODUCT_PHOTO_ITEM)
+            product_items = self.collect_product_items(driver)
 
-            products_data = self.get_products_data(driver, products, product_photos)
+            with self.create_session(driver, city) as session:
+                products_data = self.get_products_data(driver, wait, session, city, product_items)
+        except (WebDriverException, urllib3.exceptions.HTTPError, ConnectionError):
+            logger.info("Web driver failed, it will be reinitialized on the next attempt")
+            self.close()
+            raise
 
-            logger.info(f"Parsed {len(products_data)} products")
-            return products_data
+        logger.info(f"Parsed {len(products_data)} products")
+        return products_data
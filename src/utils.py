@@ -4,19 +4,27 @@ from functools import wraps
 from .logger import logger
 
 
-def retry(tries=-1, delay=0, exceptions=Exception, log=False):
+def retry(tries=-1, delay=0, backoff=2, max_delay=30, exceptions=Exception, stop_exceptions=(), log=False):
     """
     A decorator to retry a function or method in case of specified exceptions.
 
     This decorator allows a function or method to be retried a specified number of times
     if it raises any of the specified exceptions. It includes options for delaying retries,
     specifying which exceptions should trigger a retry, and logging retry attempts.
+    The number of attempts is counted separately for every call of the decorated function.
+    If the raised exception has a `retry_after` attribute with a number of seconds, such as one taken
+    from an HTTP Retry-After header, the next attempt waits at least that long, up to `max_delay`.
 
     Args:
         tries (int, optional): The maximum number of attempts. Defaults to -1, which means infinite retries.
-        delay (int, optional): Delay between attempts in seconds. Defaults to 0, which means no delay.
+        delay (int, optional): Delay before the first retry in seconds. Defaults to 0, which means no delay.
+        backoff (int, optional): Multiplier applied to the delay after each retry. Defaults to 2.
+        max_delay (int, optional): The maximum delay between attempts in seconds. Defaults to 30.
+        None means the delay is not limited.
         exceptions (Exception, optional): The type of exceptions that should trigger a retry.
         Defaults to Exception, which means all exceptions.
+        stop_exceptions (Exception, optional): The type of exceptions that are raised immediately without a retry,
+        even if they are subclasses of `exceptions`. Defaults to (), which means none.
         log (bool, optional): Whether to log retry attempts. Defaults to False.
 
     Returns:
@@ -28,26 +36,35 @@ def retry(tries=-1, delay=0, exceptions=Exception, log=False):
             # Function body that may raise ValueError
             pass
 
-    This example will retry `my_function` up to 3 times, with a 2-second delay between attempts,
+    This example will retry `my_function` up to 3 times, with 2 and 4-second delays between attempts,
     only if a ValueError is raised, and it will log each retry attempt.
     """
     def retry_decorator(func):
         @wraps(func)
         def retry_wrapper(*args, **kwargs):
-            nonlocal tries, delay, exceptions
-            while tries:
+            attempts_left = tries
+            attempt_delay = delay if max_delay is None else min(delay, max_delay)
+            while attempts_left:
                 try:
                     return func(*args, **kwargs)
+                except stop_exceptions:
+                    raise
                 except exceptions as exc:
-                    tries -= 1
+                    attempts_left -= 1
 
-                    if not tries:
+                    if not attempts_left:
                         raise exc
 
                     if log:
                         logger.error(f"Exception raised in {func.__name__}. Retrying... Exception: {str(exc)}")
 
-                    time.sleep(delay)
+                    retry_after = getattr(exc, "retry_after", None)
+                    if retry_after is not None and max_delay is not None:
+                        retry_after = min(retry_after, max_delay)
+                    time.sleep(attempt_delay if retry_after is None else max(attempt_delay, retry_after))
+                    attempt_delay *= backoff
+                    if max_delay is not None:
+                        attempt_delay = min(attempt_delay, max_delay)
 
         return retry_wrapper
 